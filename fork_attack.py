@@ -1,120 +1,159 @@
-import random
-import time
-import hashlib
+import itertools
+import numpy as np
+from multiprocessing import Pool
 from tqdm import tqdm
+from pow_hash import HASH, mine_nonce
+
+# 模拟只关心各方出块的统计结果，不检查区块哈希；为 True 时才真实执行工作量证明
+VERIFY_POW = False
+
+# 每轮的计算量很小，逐轮刷新进度条的开销不可忽略，改为每隔 PBAR_BATCH 轮刷新一次
+PBAR_BATCH = 64
 
 # 区块类：包含哈希计算与挖矿逻辑
 class Block:
-    def __init__(self, index, prev_hash, timestamp, data, nonce=0):
+    _counter = itertools.count()  # 全局递增的区块序号
+
+    def __init__(self, index, prev_hash, data, nonce=0):
         self.index = index                  # 区块在链中的索引位置
         self.prev_hash = prev_hash          # 前一个区块的哈希值
-        self.timestamp = timestamp          # 区块创建时间
+        self.timestamp = next(Block._counter)  # 区块创建序号，代替时间戳保证各区块的哈希输入互不相同
         self.data = data                    # 区块存储的数据（如 "Honest" 或 "Malicious"）
         self.nonce = nonce                  # 挖矿过程中的随机数，用于改变哈希输出
-        self.hash = self.calculate_hash()   # 计算初始哈希值
+        # 除 nonce 外的哈希输入创建后不再变化：第一次计算哈希时才吸收一次，之后复制哈希对象并追加 nonce。
+        # 模拟模式下区块不做任何哈希计算，hash 保持为 None
+        self._base = None
+        self.hash = self.calculate_hash() if VERIFY_POW else None
+
+    def _prefix(self):
+        # 哈希输入中除 nonce 外的部分
+        return f"{self.index}{self.prev_hash}{self.timestamp}{self.data}".encode('utf-8')
 
     def calculate_hash(self):
-        # 计算当前区块的 SHA-256 哈希值
-        block_string = f"{self.index}{self.prev_hash}{self.timestamp}{self.data}{self.nonce}"
-        return hashlib.sha256(block_string.encode('utf-8')).hexdigest()
+        # 计算当前区块的哈希值（哈希函数由 pow_hash.HASH 指定）
+        if self._base is None:
+            self._base = HASH(self._prefix())
+        h = self._base.copy()
+        h.update(str(self.nonce).encode('utf-8'))
+        return h.hexdigest()
 
     def mine(self, difficulty):
         # 执行工作量证明：找到哈希前缀为 '0'*difficulty 的 nonce
-        target = '0' * difficulty
-        while not self.hash.startswith(target):
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        self.nonce = mine_nonce(self._prefix(), difficulty, self.nonce)
+        self.hash = self.calculate_hash()
         return self.hash
 
+    def simulate_mine(self, difficulty, rng):
+        # 不计算哈希，直接抽样挖矿所需的尝试次数：每次尝试成功概率为 16**-difficulty，
+        # 首次成功所需次数服从几何分布，与真实挖矿得到的 nonce 分布一致；由调用方传入的 rng 抽样，固定种子即可复现
+        self.nonce += int(rng.geometric(16.0 ** -difficulty)) - 1
+
 # 诚实节点类
 class HonestNode:
-    def __init__(self, mine_success_rate):
-        self.mine_success_rate = mine_success_rate  # 每轮挖矿成功概率
-        self.chain = [self.create_genesis_block()]  # 初始化链，包含创世区块
+    def __init__(self):
+        self._genesis = self.create_genesis_block()  # 创世区块只创建一次，重置时复用
+        self.chain = [self._genesis]  # 初始化链，包含创世区块
 
     def create_genesis_block(self):
-        return Block(0, "0", time.time(), "Genesis")
-
-    def try_mine_block(self, difficulty):
-        # 如果成功触发挖矿，则创建新块并执行挖矿（满足哈希难度）
-        if random.random() < self.mine_success_rate:
-            prev_block = self.chain[-1]
-            new_block = Block(
-                index=prev_block.index + 1,
-                prev_hash=prev_block.hash,
-                timestamp=time.time(),
-                data="Honest"
-            )
+        return Block(0, "0", "Genesis")
+
+    def reset(self):
+        # 回到只有创世区块的初始状态，使同一节点对象可在多轮实验中复用
+        self.chain = [self._genesis]
+
+    def mine_block(self, difficulty, rng):
+        # 在本地链末端创建新块并执行挖矿（满足哈希难度）
+        prev_block = self.chain[-1]
+        new_block = Block(
+            index=prev_block.index + 1,
+            prev_hash=prev_block.hash,
+            data="Honest"
+        )
+        if VERIFY_POW:
             new_block.mine(difficulty)
-            self.chain.append(new_block)
+        else:
+            new_block.simulate_mine(difficulty, rng)
+        self.chain.append(new_block)
 
 # 恶意节点类
 class MaliciousNode:
-    def __init__(self, mine_success_rate):
-        self.mine_success_rate = mine_success_rate  # 挖矿成功概率（可调高以模拟攻击优势）
-        self.chain = [self.create_genesis_block()]  # 初始化链
+    def __init__(self):
+        self._genesis = self.create_genesis_block()  # 创世区块只创建一次，重置时复用
+        self.chain = [self._genesis]  # 初始化链
 
     def create_genesis_block(self):
-        return Block(0, "0", time.time(), "Genesis")
-
-    def try_mine_block(self, difficulty):
-        # 模拟恶意出块，与诚实节点机制相同，仅 data 字段不同
-        if random.random() < self.mine_success_rate:
-            prev_block = self.chain[-1]
-            new_block = Block(
-                index=prev_block.index + 1,
-                prev_hash=prev_block.hash,
-                timestamp=time.time(),
-                data="Malicious"
-            )
+        return Block(0, "0", "Genesis")
+
+    def reset(self):
+        # 回到只有创世区块的初始状态
+        self.chain = [self._genesis]
+
+    def mine_block(self, difficulty, rng):
+        # 与诚实节点出块机制相同，仅 data 字段不同
+        prev_block = self.chain[-1]
+        new_block = Block(
+            index=prev_block.index + 1,
+            prev_hash=prev_block.hash,
+            data="Malicious"
+        )
+        if VERIFY_POW:
             new_block.mine(difficulty)
-            self.chain.append(new_block)
-
-# 统一最长链：所有节点切换到全网最长链副本
-def select_chain(nodes):
-    max_len = max(len(node.chain) for node in nodes)
-    candidates = [node for node in nodes if len(node.chain) == max_len]
-    chosen = random.choice(candidates)
-    for node in nodes:
-        node.chain = chosen.chain.copy()
-    return chosen.chain
+        else:
+            new_block.simulate_mine(difficulty, rng)
+        self.chain.append(new_block)
+
+# 每个进程只创建一次双方的代表节点（第一次运行 _run_round 时创建），之后各轮实验开始时重置即可
+_honest_node = None
+_malicious_node = None
+
+# 单轮分叉攻击实验：双方从创世块开始出块，直到任一链超过阈值长度；恶意链胜出返回 1，否则返回 0
+def _run_round(args):
+    global _honest_node, _malicious_node
+    seed, honest_count, malicious_count, success_rate, difficulty, threshold = args
+    rng = np.random.default_rng(seed)
+
+    # 同一方的节点每轮都会同步到该方最长链，因此每方只需维护一条代表链：
+    # 本轮只要有任一节点出块，该方最长链就增长一个区块
+    if _honest_node is None:
+        _honest_node = HonestNode()
+        _malicious_node = MaliciousNode()
+    honest_node = _honest_node
+    malicious_node = _malicious_node
+    honest_node.reset()
+    malicious_node.reset()
+
+    # 不断尝试出块直到任一链达到阈值长度
+    while True:
+        # 一次二项分布抽样得到本轮各方出块节点数，代替逐节点调用 random.random()
+        if rng.binomial(honest_count, success_rate) > 0:
+            honest_node.mine_block(difficulty, rng)
+        if rng.binomial(malicious_count, success_rate) > 0:
+            malicious_node.mine_block(difficulty, rng)
+
+        len_h = len(honest_node.chain) - 1  # 去掉创世块
+        len_m = len(malicious_node.chain) - 1
+
+        if len_h > threshold or len_m > threshold:
+            # 若恶意链更长或同长（随机 50% 概率胜出），视为成功
+            if len_m > len_h or (len_m == len_h and rng.random() < 0.5):
+                return 1
+            return 0
 
 # 区块链模拟函数，评估恶意链替代主链的概率
 def simulate_blockchain(node_count, malicious_rate, success_rate, rounds, difficulty, seed=None):
-    if seed is not None:
-        random.seed(seed)  # 固定随机种子以保证实验可复现
-
     honest_count = int(node_count * (1 - malicious_rate))  # 诚实节点数量
     malicious_count = node_count - honest_count            # 恶意节点数量
     threshold = 6  # 当链长度达到此阈值时判断是否结束该轮
     malicious_win_count = 0  # 恶意链替代主链的成功计数
 
-    with tqdm(total=rounds, dynamic_ncols=False) as pbar:
-        for _ in range(rounds):
-            # 初始化每轮的节点
-            honest_nodes = [HonestNode(success_rate) for _ in range(honest_count)]
-            malicious_nodes = [MaliciousNode(success_rate) for _ in range(malicious_count)]
-
-            # 不断尝试出块直到任一链达到阈值长度
-            while True:
-                for node in honest_nodes:
-                    node.try_mine_block(difficulty)
-                for node in malicious_nodes:
-                    node.try_mine_block(difficulty)
-
-                # 选取当前各方的最长链
-                chain_honest = select_chain(honest_nodes)
-                chain_malicious = select_chain(malicious_nodes)
-
-                len_h = len(chain_honest) - 1  # 去掉创世块
-                len_m = len(chain_malicious) - 1
-
-                if len_h > threshold or len_m > threshold:
-                    # 若恶意链更长或同长（随机 50% 概率胜出），视为成功
-                    if len_m > len_h or (len_m == len_h and random.random() < 0.5):
-                        malicious_win_count += 1
-                    break  # 本轮结束
-            pbar.update(1)
+    # 各轮实验相互独立，分发到多个进程并行执行；第 i 轮使用种子 seed + i，保证实验可复现
+    tasks = [(None if seed is None else seed + i, honest_count, malicious_count, success_rate, difficulty, threshold)
+             for i in range(rounds)]
+    with Pool() as pool, tqdm(total=rounds, dynamic_ncols=False, mininterval=0.5, miniters=PBAR_BATCH) as pbar:
+        for done, result in enumerate(pool.imap_unordered(_run_round, tasks, chunksize=64), 1):
+            malicious_win_count += result
+            if done % PBAR_BATCH == 0 or done == rounds:
+                pbar.update(done - pbar.n)
 
     print(f"Malicious Rate: {malicious_rate}, Percentage of Fork Attack Success: {(malicious_win_count / rounds):.4f}")
 
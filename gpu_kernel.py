@@ -0,0 +1,150 @@
+# GPU 挖矿内核：用 PyOpenCL 在成千上万个工作项上并行计算 SHA-256，每次内核启动覆盖一整批 nonce
+import numpy as np
+import pyopencl as cl
+
+# OpenCL 内核：每个工作项负责 nonce = base + gid，拼接 prefix 与 nonce 的 ASCII 数字后计算 SHA-256，
+# 满足前导 0 位要求时用 atomic_min 记录最小的 gid，保证结果与顺序搜索一致
+_KERNEL_SRC = r"""
+__constant uint K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+};
+
+#define ROTR(x, n) rotate((uint)(x), (uint)(32 - (n)))
+
+static void compress(uint *state, const uchar *blk)
+{
+    uint w[64];
+    for (int t = 0; t < 16; t++)
+        w[t] = ((uint)blk[4 * t] << 24) | ((uint)blk[4 * t + 1] << 16) | ((uint)blk[4 * t + 2] << 8) | (uint)blk[4 * t + 3];
+    for (int t = 16; t < 64; t++) {
+        uint s0 = ROTR(w[t - 15], 7) ^ ROTR(w[t - 15], 18) ^ (w[t - 15] >> 3);
+        uint s1 = ROTR(w[t - 2], 17) ^ ROTR(w[t - 2], 19) ^ (w[t - 2] >> 10);
+        w[t] = w[t - 16] + s0 + w[t - 7] + s1;
+    }
+    uint a = state[0], b = state[1], c = state[2], d = state[3];
+    uint e = state[4], f = state[5], g = state[6], h = state[7];
+    for (int t = 0; t < 64; t++) {
+        uint t1 = h + (ROTR(e, 6) ^ ROTR(e, 11) ^ ROTR(e, 25)) + bitselect(g, f, e) + K[t] + w[t];
+        uint t2 = (ROTR(a, 2) ^ ROTR(a, 13) ^ ROTR(a, 22)) + bitselect(b, c, a ^ b);
+        h = g; g = f; f = e; e = d + t1;
+        d = c; c = b; b = a; a = t1 + t2;
+    }
+    state[0] += a; state[1] += b; state[2] += c; state[3] += d;
+    state[4] += e; state[5] += f; state[6] += g; state[7] += h;
+}
+
+__kernel void search(__global const uchar *prefix, uint prefix_len, ulong base, uint bits,
+                     volatile __global uint *result)
+{
+    uint gid = get_global_id(0);
+    ulong nonce = base + gid;
+    uchar msg[MSG_SIZE];
+
+    for (uint i = 0; i < prefix_len; i++)
+        msg[i] = prefix[i];
+
+    uint digits = 1;
+    for (ulong x = nonce / 10; x > 0; x /= 10)
+        digits++;
+    ulong x = nonce;
+    for (uint i = 0; i < digits; i++) {
+        msg[prefix_len + digits - 1 - i] = (uchar)('0' + x % 10);
+        x /= 10;
+    }
+
+    uint len = prefix_len + digits;
+    uint total = ((len + 8) / 64 + 1) * 64;
+    msg[len] = 0x80;
+    for (uint i = len + 1; i < total - 8; i++)
+        msg[i] = 0;
+    ulong bit_len = (ulong)len * 8;
+    for (int i = 0; i < 8; i++)
+        msg[total - 1 - i] = (uchar)(bit_len >> (8 * i));
+
+    uint state[8] = {0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+                     0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19};
+    for (uint off = 0; off < total; off += 64)
+        compress(state, msg + off);
+
+    for (int i = 0; i < 8 && bits > 0; i++) {
+        if (bits >= 32) {
+            if (state[i] != 0)
+                return;
+            bits -= 32;
+        } else {
+            if ((state[i] >> (32 - bits)) != 0)
+                return;
+            bits = 0;
+        }
+    }
+    atomic_min(result, gid);
+}
+"""
+
+# 没有可用的 OpenCL 设备时视同未安装，调用方回退到 CPU 挖矿
+try:
+    _devices = [d for p in cl.get_platforms() for d in p.get_devices()]
+except cl.Error:
+    _devices = []
+if not _devices:
+    raise ImportError("no OpenCL device available")
+
+BATCH = 1 << 20          # 每次内核启动覆盖的 nonce 数量
+_NO_HIT = 0xFFFFFFFF     # 结果缓冲区初值：表示本批没有命中
+
+_ctx = None
+_queue = None
+_programs = {}           # 按消息缓冲区大小缓存已编译的程序
+
+
+def _program(msg_size):
+    global _ctx, _queue
+    if _ctx is None:
+        _ctx = cl.create_some_context(interactive=False)
+        _queue = cl.CommandQueue(_ctx)
+    if msg_size not in _programs:
+        _programs[msg_size] = cl.Program(_ctx, _KERNEL_SRC).build(options=[f"-D MSG_SIZE={msg_size}"])
+    return _programs[msg_size]
+
+
+def gpu_mine(prefix, difficulty, start=0):
+    # 在 GPU 上从 start 开始搜索最小的 nonce，使 SHA-256(prefix + str(nonce)) 的十六进制前缀有 difficulty 个 0
+    msg_size = ((len(prefix) + 20 + 8) // 64 + 1) * 64  # 足以容纳前缀、最长 20 位的 nonce 及填充
+    kernel = cl.Kernel(_program(msg_size), "search")
+    mf = cl.mem_flags
+    # 末尾多补一个字节，避免空前缀时创建长度为 0 的缓冲区
+    prefix_buf = cl.Buffer(_ctx, mf.READ_ONLY | mf.COPY_HOST_PTR, hostbuf=np.frombuffer(prefix + b"\0", dtype=np.uint8))
+    kernel.set_arg(0, prefix_buf)
+    kernel.set_arg(1, np.uint32(len(prefix)))
+    kernel.set_arg(3, np.uint32(4 * difficulty))
+
+    # 两组结果缓冲区交替使用：读取上一批结果的同时，下一批内核已经在设备上排队执行
+    init = np.full(1, _NO_HIT, dtype=np.uint32)
+    results = [cl.Buffer(_ctx, mf.READ_WRITE, 4) for _ in range(2)]
+    hosts = [cl.enqueue_map_buffer(_queue, cl.Buffer(_ctx, mf.ALLOC_HOST_PTR, 4), cl.map_flags.READ | cl.map_flags.WRITE,
+                                   0, (1,), np.uint32)[0] for _ in range(2)]  # 页锁定的主机缓冲区
+
+    def launch(slot, base):
+        cl.enqueue_copy(_queue, results[slot], init, is_blocking=False)
+        kernel.set_arg(2, np.uint64(base))
+        kernel.set_arg(4, results[slot])
+        cl.enqueue_nd_range_kernel(_queue, kernel, (BATCH,), None)
+        return cl.enqueue_copy(_queue, hosts[slot], results[slot], is_blocking=False)
+
+    pending = launch(0, start)
+    slot = 0
+    while True:
+        following = launch(1 - slot, start + BATCH)
+        pending.wait()
+        hit = int(hosts[slot][0])
+        if hit != _NO_HIT:
+            following.wait()
+            return start + hit
+        pending, slot, start = following, 1 - slot, start + BATCH
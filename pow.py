@@ -1,80 +1,94 @@
-import hashlib
-import time
-import random
+import itertools
+import numpy as np
 from tqdm import tqdm  # 用于显示进度条
+from pow_hash import HASH, mine_nonce
+
+# 模拟只关心各方出块的统计结果，不检查区块哈希；为 True 时才真实执行工作量证明
+VERIFY_POW = False
+
+# 每轮的计算量很小，逐轮刷新进度条的开销不可忽略，改为每隔 PBAR_BATCH 轮刷新一次
+PBAR_BATCH = 64
 
 # 区块类：包含哈希计算与挖矿逻辑
 class Block:
-    def __init__(self, index, prev_hash, timestamp, data, nonce=0):
+    _counter = itertools.count()  # 全局递增的区块序号
+
+    def __init__(self, index, prev_hash, data, nonce=0):
         self.index = index                  # 区块在链中的索引位置
         self.prev_hash = prev_hash          # 前一个区块的哈希值
-        self.timestamp = timestamp          # 区块创建时间
+        self.timestamp = next(Block._counter)  # 区块创建序号，代替时间戳保证各区块的哈希输入互不相同
         self.data = data                    # 区块存储的数据（本例中是标记）
         self.nonce = nonce                  # 挖矿过程中的计数器（用于改变哈希输出）
-        self.hash = self.calculate_hash()   # 当前区块的哈希值，初始时就计算
+        # 除 nonce 外的哈希输入创建后不再变化：第一次计算哈希时才吸收一次，之后复制哈希对象并追加 nonce。
+        # 模拟模式下区块不做任何哈希计算，hash 保持为 None
+        self._base = None
+        self.hash = self.calculate_hash() if VERIFY_POW else None
 
-    # 使用 SHA-256 计算当前区块的哈希值
+    # 哈希输入中除 nonce 外的部分
+    def _prefix(self):
+        return f"{self.index}{self.prev_hash}{self.timestamp}{self.data}".encode('utf-8')
+
+    # 计算当前区块的哈希值（哈希函数由 pow_hash.HASH 指定）
     def calculate_hash(self):
-        block_string = f"{self.index}{self.prev_hash}{self.timestamp}{self.data}{self.nonce}"
-        return hashlib.sha256(block_string.encode('utf-8')).hexdigest()
+        if self._base is None:
+            self._base = HASH(self._prefix())
+        h = self._base.copy()
+        h.update(str(self.nonce).encode('utf-8'))
+        return h.hexdigest()
 
     # 挖矿函数：不断尝试增加 nonce，使得哈希前缀为指定数量的 0（即满足难度要求）
     def mine(self, difficulty):
-        target = '0' * difficulty  # 目标前缀，例如 '000' 表示难度为3
-        while not self.hash.startswith(target):
-            self.nonce += 1
-            self.hash = self.calculate_hash()
-        return self.hash  # 返回满足条件的哈希
+        self.nonce = mine_nonce(self._prefix(), difficulty, self.nonce)
+        self.hash = self.calculate_hash()
+        return self.hash
+
+    # 模拟挖矿：不计算哈希，直接抽样所需的尝试次数。每次尝试成功概率为 16**-difficulty，
+    # 首次成功所需次数服从几何分布，与真实挖矿得到的 nonce 分布一致；由调用方传入的 rng 抽样，固定种子即可复现
+    def simulate_mine(self, difficulty, rng):
+        self.nonce += int(rng.geometric(16.0 ** -difficulty)) - 1
 
 # 节点类：代表一个诚实节点，包含其本地区块链副本
 class Node:
-    def __init__(self, mine_success_rate):
-        self.mine_success_rate = mine_success_rate  # 每轮尝试出块的概率
+    def __init__(self):
         self.chain = [self.create_genesis_block()]  # 初始化时包含创世区块
 
     # 创建创世区块（第一个区块）
     def create_genesis_block(self):
-        return Block(0, "0", time.time(), "Genesis")
-
-    # 每一轮尝试挖出一个新区块，若成功则进行哈希计算并添加到链中
-    def try_mine_block(self, difficulty):
-        if random.random() < self.mine_success_rate:
-            prev_block = self.chain[-1]
-            new_block = Block(
-                index=prev_block.index + 1,
-                prev_hash=prev_block.hash,
-                timestamp=time.time(),
-                data="Honest"
-            )
+        return Block(0, "0", "Genesis")
+
+    # 挖出一个新区块：进行哈希计算并添加到链中
+    def mine_block(self, difficulty, rng):
+        prev_block = self.chain[-1]
+        new_block = Block(
+            index=prev_block.index + 1,
+            prev_hash=prev_block.hash,
+            data="Honest"
+        )
+        if VERIFY_POW:
             new_block.mine(difficulty)
-            self.chain.append(new_block)  # 添加成功挖出的新区块
-
-def select_chain(nodes):
-    max_len = max(len(node.chain) for node in nodes)  # 找出最长链长度
-    candidates = [node for node in nodes if len(node.chain) == max_len]  # 所有拥有最长链的节点
-    chosen = random.choice(candidates)  # 随机选一个作为标准链
-    for node in nodes:
-        node.chain = chosen.chain.copy()  # 所有节点同步为标准链副本
-    return chosen.chain  # 返回当前的全网统一链
+        else:
+            new_block.simulate_mine(difficulty, rng)
+        self.chain.append(new_block)  # 添加成功挖出的新区块
 
 def simulate_blockchain(node_count, difficulty, rounds, success_rate, seed=None):
-    if seed is not None:
-        random.seed(seed)  # 固定随机种子，确保结果可重复
+    rng = np.random.default_rng(seed)  # 固定随机种子，确保结果可重复
 
-    # 初始化所有节点（诚实节点），使用统一出块概率
-    nodes = [Node(success_rate) for _ in range(node_count)]
+    # 所有节点每轮都会同步到同一条最长链，因此只需维护一条代表链：
+    # 本轮只要有任一节点出块，最长链就增长一个区块
+    node = Node()
     prev_length = 1  # 初始链长度为1（只有创世块）
 
-    with tqdm(total=rounds) as pbar:  # 使用 tqdm 显示进度
+    with tqdm(total=rounds, mininterval=0.5, miniters=PBAR_BATCH) as pbar:  # 使用 tqdm 显示进度
         for r in range(1, rounds + 1):  # 从第1轮开始
-            for node in nodes:
-                node.try_mine_block(difficulty)  # 每个节点尝试出块（有成功率）
-
-            selected_chain = select_chain(nodes)  # 所有节点统一到最长链
-            current_length = len(selected_chain)  # 当前链长度
-            growth_rate = (current_length - prev_length) / r  # 当前平均增长率
-            pbar.set_description(f"Chain Growth Rate: {growth_rate:.4f}")  # 实时更新增长率
-            pbar.update(1)
+            # 一次二项分布抽样得到本轮出块节点数，代替逐节点调用 random.random()
+            if rng.binomial(node_count, success_rate) > 0:
+                node.mine_block(difficulty, rng)
+
+            current_length = len(node.chain)  # 当前链长度
+            if r % PBAR_BATCH == 0 or r == rounds:
+                growth_rate = (current_length - prev_length) / r  # 当前平均增长率
+                pbar.set_description(f"Chain Growth Rate: {growth_rate:.4f}", refresh=False)  # 描述随下一次 update 一起按节流间隔刷新
+                pbar.update(r - pbar.n)
 
     # 打印最终增长率（即每轮平均新增区块数）
     final_growth_rate = (current_length - prev_length) / rounds
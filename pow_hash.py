@@ -0,0 +1,51 @@
+# 工作量证明使用的哈希函数：三个模拟脚本都从这里取，修改 HASH 即可统一切换
+import functools
+import hashlib
+
+# 模拟只关心前导 0 的统计性质，哈希函数本身不影响结果；BLAKE2b 在没有 SHA 扩展的 CPU 上比 SHA-256 更快。
+# 输出取 32 字节，与 SHA-256 等长，难度与十六进制哈希的长度保持不变
+HASH = functools.partial(hashlib.blake2b, digest_size=32)
+
+# Numba / OpenCL / SHA-NI 加速内核只实现了 SHA-256，仅当 HASH 为 hashlib.sha256 时才会加载。
+# 默认的 BLAKE2b 下 mine_nonce 始终使用 hashlib；要启用加速内核，需把 HASH 改为 hashlib.sha256，
+# 并把 pow.py / fork_attack.py 中的 VERIFY_POW 设为 True（否则模拟不执行真实挖矿，也就用不到任何内核）
+NATIVE_SHA256 = HASH is hashlib.sha256
+
+find_nonce = gpu_mine = sha_ni_mine = None
+if NATIVE_SHA256:
+    try:
+        from pow_kernel import find_nonce  # 可选：安装了 numba 时使用 JIT 编译的挖矿内核
+    except ImportError:
+        pass
+
+    try:
+        from gpu_kernel import gpu_mine  # 可选：有 OpenCL 设备时，高难度挖矿交给 GPU
+    except ImportError:
+        pass
+
+    try:
+        from sha_ni_kernel import sha_ni_mine, MAX_TAIL as SHA_NI_MAX_TAIL  # 可选：编译了 sha_ni_mine.so 且 CPU 支持 SHA 扩展时使用
+    except ImportError:
+        pass
+
+
+def mine_nonce(prefix, difficulty, start=0):
+    # 从 start 开始搜索最小的 nonce，使 HASH(prefix + str(nonce)) 的十六进制前缀有 difficulty 个 0；
+    # 依次尝试可用的加速内核，都不可用时回退到 hashlib 逐个尝试
+    if gpu_mine is not None and difficulty >= 4:
+        return gpu_mine(prefix, difficulty, start)
+    if sha_ni_mine is not None and len(prefix) % 64 < SHA_NI_MAX_TAIL:
+        nonce, start = sha_ni_mine(prefix, difficulty, start)
+        if nonce is not None:
+            return nonce
+    if find_nonce is not None:
+        return find_nonce(prefix, 4 * difficulty, start)
+    base = HASH(prefix)  # 前缀只吸收一次，每次尝试复制哈希对象并追加 nonce
+    target = 1 << (256 - 4 * difficulty)  # 十六进制前缀有 difficulty 个 0，等价于摘要按整数小于该值
+    nonce = start
+    while True:
+        h = base.copy()
+        h.update(str(nonce).encode('utf-8'))
+        if int.from_bytes(h.digest(), 'big') < target:
+            return nonce
+        nonce += 1
@@ -0,0 +1,158 @@
+# 工作量证明加速内核：用 Numba 将 SHA-256 与 nonce 搜索循环编译为机器码，消除解释器逐次调用的开销
+import numpy as np
+from numba import njit, prange, get_num_threads
+
+# SHA-256 轮常量
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+# SHA-256 初始哈希值
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+_MASK = 0xFFFFFFFF
+
+
+@njit(cache=True, boundscheck=False)
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+
+@njit(cache=True, boundscheck=False)
+def _compress(state, msg, offset, w):
+    # 对 msg[offset:offset+64] 这一分组执行一次压缩函数，结果写回 state（32 位字保存在 int64 中）
+    for t in range(16):
+        i = offset + 4 * t
+        w[t] = (np.int64(msg[i]) << 24) | (np.int64(msg[i + 1]) << 16) | (np.int64(msg[i + 2]) << 8) | np.int64(msg[i + 3])
+    for t in range(16, 64):
+        s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+        s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+        w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & _MASK
+
+    a, b, c, d, e, f, g, h = state[0], state[1], state[2], state[3], state[4], state[5], state[6], state[7]
+    for t in range(64):
+        S1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g & _MASK)
+        t1 = (h + S1 + ch + _K[t] + w[t]) & _MASK
+        S0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (S0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+
+@njit(cache=True, boundscheck=False)
+def _leading_zero_bits_ok(state, bits):
+    # 检查摘要最高 bits 位是否全为 0
+    for i in range(8):
+        if bits <= 0:
+            return True
+        if bits >= 32:
+            if state[i] != 0:
+                return False
+            bits -= 32
+        else:
+            return (state[i] >> (32 - bits)) == 0
+    return True
+
+
+@njit(cache=True, boundscheck=False)
+def _midstate(prefix, full):
+    # 前缀中完整的 64 字节分组与 nonce 无关：只压缩一次，得到的中间状态供每次尝试复用
+    state = _H0.copy()
+    w = np.empty(64, np.int64)
+    for offset in range(0, full, 64):
+        _compress(state, prefix, offset, w)
+    return state
+
+
+@njit(cache=True, boundscheck=False)
+def _hash_nonce(mid, full, tail_len, nonce, msg, state, w):
+    # 计算 SHA-256(prefix + str(nonce))：从中间状态 mid 出发，只压缩包含 nonce 的尾部分组。
+    # 前缀剩余的 tail_len 字节已预先拷贝在 msg 开头，这里只改写 nonce 的 ASCII 数字及填充
+    digits = 1
+    x = nonce // 10
+    while x > 0:
+        digits += 1
+        x //= 10
+    x = nonce
+    for i in range(digits):
+        msg[tail_len + digits - 1 - i] = 48 + x % 10
+        x //= 10
+    length = tail_len + digits
+    total = ((length + 8) // 64 + 1) * 64
+    msg[length] = 0x80
+    for i in range(length + 1, total - 8):
+        msg[i] = 0
+    bit_len = (full + length) * 8
+    for i in range(8):
+        msg[total - 1 - i] = (bit_len >> (8 * i)) & 0xFF
+
+    for i in range(8):
+        state[i] = mid[i]
+    for offset in range(0, total, 64):
+        _compress(state, msg, offset, w)
+
+
+@njit(cache=True, boundscheck=False, parallel=True)
+def _search(prefix, mid, bits, start, batch, lanes):
+    # 将 [start, start+batch) 按 lanes 条交错条带分给各线程；每条带只需找到自己的第一个解
+    hits = np.full(lanes, -1, np.int64)
+    n = prefix.shape[0]
+    full = n // 64 * 64
+    tail_len = n - full
+    size = ((tail_len + 20 + 8) // 64 + 1) * 64  # 足以容纳前缀尾部、最长 19 位的 nonce 及填充
+    for lane in prange(lanes):
+        msg = np.zeros(size, np.uint8)
+        msg[:tail_len] = prefix[full:]
+        state = np.empty(8, np.int64)
+        w = np.empty(64, np.int64)
+        for nonce in range(start + lane, start + batch, lanes):
+            _hash_nonce(mid, full, tail_len, nonce, msg, state, w)
+            if _leading_zero_bits_ok(state, bits):
+                hits[lane] = nonce
+                break
+
+    # 取所有条带中最小的解，保证结果与顺序搜索一致
+    best = -1
+    for lane in range(lanes):
+        if hits[lane] >= 0 and (best < 0 or hits[lane] < best):
+            best = hits[lane]
+    return best
+
+
+def find_nonce(prefix, bits, start=0):
+    # 从 start 开始搜索最小的 nonce，使 SHA-256(prefix + str(nonce)) 的前 bits 位全为 0
+    data = np.frombuffer(prefix, dtype=np.uint8)
+    mid = _midstate(data, len(prefix) // 64 * 64)
+    lanes = get_num_threads()
+    batch = max(lanes * 64, 1 << min(bits, 24))  # 每批尝试次数与期望尝试次数 2**bits 同量级
+    while True:
+        nonce = _search(data, mid, bits, start, batch, lanes)
+        if nonce >= 0:
+            return int(nonce)
+        start += batch
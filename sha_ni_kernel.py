@@ -0,0 +1,24 @@
+# SHA-NI 挖矿：通过 ctypes 加载 sha_ni_mine.so（编译方法见 sha_ni_mine.c）
+import ctypes
+import os
+
+MAX_TAIL = 55  # 前缀按 64 字节分组后剩余的尾部须短于此值，尾部加 nonce 才能放进一个分组
+
+# 共享库不存在或 CPU 不支持 SHA 扩展时视同未安装，调用方回退到其他挖矿实现
+try:
+    _lib = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sha_ni_mine.so"))
+except OSError as e:
+    raise ImportError("sha_ni_mine.so not built") from e
+if not _lib.sha_ni_supported():
+    raise ImportError("CPU does not support SHA extensions")
+
+_lib.sha_ni_mine.argtypes = [ctypes.c_char_p, ctypes.c_uint32, ctypes.c_uint64, ctypes.c_int, ctypes.POINTER(ctypes.c_uint64)]
+_lib.sha_ni_mine.restype = ctypes.c_int64
+
+
+def sha_ni_mine(prefix, difficulty, start=0):
+    # 从 start 开始搜索满足难度的最小 nonce，返回 (nonce, 下一个待尝试的 nonce)；
+    # nonce 位数增加到尾部放不进一个分组仍未找到时 nonce 为 None，调用方从返回的位置继续搜索
+    resume = ctypes.c_uint64(start)
+    nonce = _lib.sha_ni_mine(prefix, len(prefix), start, difficulty, ctypes.byref(resume))
+    return (None, resume.value) if nonce < 0 else (nonce, nonce)
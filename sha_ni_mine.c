@@ -0,0 +1,173 @@
+/*
+ * SHA-NI 挖矿内核：前缀中完整的 64 字节分组与 nonce 无关，先压缩一次得到中间状态；
+ * 前缀剩余部分与 nonce 合计不超过 55 字节时，含 nonce 的尾部连同填充恰好是一个 64 字节分组。
+ * 尾部分组只在 nonce 位数变化时重新填充，每次尝试仅就地递增 nonce 的 ASCII 数字，
+ * 再用 Intel SHA 扩展指令（sha256rnds2 / sha256msg1 / sha256msg2）从中间状态完成一次压缩，
+ * 跳过通用 update/finalize 的全部开销。
+ *
+ * 编译：gcc -O3 -msha -msse4.1 -shared -fPIC sha_ni_mine.c -o sha_ni_mine.so
+ * Python 侧通过 sha_ni_kernel.py 用 ctypes 加载。
+ */
+#include <stdint.h>
+#include <string.h>
+#include <cpuid.h>
+#include <immintrin.h>
+
+#define MAX_SINGLE_BLOCK 55
+
+static const uint32_t K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+};
+
+static const uint32_t H0[8] = {
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+};
+
+/* CPU 是否支持 SHA 扩展（CPUID.(EAX=7,ECX=0):EBX[29]） */
+int sha_ni_supported(void)
+{
+    unsigned int eax, ebx, ecx, edx;
+    if (!__get_cpuid_count(7, 0, &eax, &ebx, &ecx, &edx))
+        return 0;
+    return (ebx >> 29) & 1;
+}
+
+/* 从 in 出发对单个分组做一次压缩，结果按 A..H 顺序写入 out（in 与 out 可以相同） */
+static void sha256_block(uint32_t out[8], const uint32_t in[8], const uint8_t block[64])
+{
+    const __m128i MASK = _mm_set_epi64x(0x0c0d0e0f08090a0bULL, 0x0405060700010203ULL);
+    __m128i STATE0, STATE1, MSG, TMP, ABEF_SAVE, CDGH_SAVE;
+    __m128i M[4];
+
+    TMP = _mm_loadu_si128((const __m128i *)&in[0]);
+    STATE1 = _mm_loadu_si128((const __m128i *)&in[4]);
+    TMP = _mm_shuffle_epi32(TMP, 0xB1);          /* CDAB */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0x1B);    /* EFGH */
+    STATE0 = _mm_alignr_epi8(TMP, STATE1, 8);    /* ABEF */
+    STATE1 = _mm_blend_epi16(STATE1, TMP, 0xF0); /* CDGH */
+    ABEF_SAVE = STATE0;
+    CDGH_SAVE = STATE1;
+
+    /* 每次迭代 4 轮，M[g & 3] 为当前消息字，M 的其余三项滚动生成后续消息调度 */
+#pragma GCC unroll 16
+    for (int g = 0; g < 16; g++) {
+        if (g < 4)
+            M[g] = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(block + 16 * g)), MASK);
+        __m128i cur = M[g & 3];
+        MSG = _mm_add_epi32(cur, _mm_loadu_si128((const __m128i *)&K[4 * g]));
+        STATE1 = _mm_sha256rnds2_epu32(STATE1, STATE0, MSG);
+        if (g >= 3 && g <= 14) {
+            TMP = _mm_alignr_epi8(cur, M[(g + 3) & 3], 4);
+            M[(g + 1) & 3] = _mm_add_epi32(M[(g + 1) & 3], TMP);
+            M[(g + 1) & 3] = _mm_sha256msg2_epu32(M[(g + 1) & 3], cur);
+        }
+        MSG = _mm_shuffle_epi32(MSG, 0x0E);
+        STATE0 = _mm_sha256rnds2_epu32(STATE0, STATE1, MSG);
+        if (g >= 1 && g <= 12)
+            M[(g + 3) & 3] = _mm_sha256msg1_epu32(M[(g + 3) & 3], cur);
+    }
+
+    STATE0 = _mm_add_epi32(STATE0, ABEF_SAVE);
+    STATE1 = _mm_add_epi32(STATE1, CDGH_SAVE);
+
+    TMP = _mm_shuffle_epi32(STATE0, 0x1B);       /* FEBA */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0xB1);    /* DCHG */
+    STATE0 = _mm_blend_epi16(TMP, STATE1, 0xF0); /* DCBA */
+    STATE1 = _mm_alignr_epi8(STATE1, TMP, 8);    /* ABEF */
+    _mm_storeu_si128((__m128i *)&out[0], STATE0);
+    _mm_storeu_si128((__m128i *)&out[4], STATE1);
+}
+
+/* 检查摘要的十六进制前缀是否有 difficulty 个 0 */
+static int digest_ok(const uint32_t *digest, int difficulty)
+{
+    int bits = 4 * difficulty;
+    for (int i = 0; i < 8 && bits > 0; i++) {
+        if (bits >= 32) {
+            if (digest[i] != 0)
+                return 0;
+            bits -= 32;
+        } else {
+            return (digest[i] >> (32 - bits)) == 0;
+        }
+    }
+    return 1;
+}
+
+/*
+ * 在尾部分组 block 中写入 nonce 的 ASCII 数字及 SHA-256 填充，返回位数；超出单分组容量时返回 0。
+ * tail_len 为前缀剩余部分的长度，full 为已并入中间状态的字节数（用于填充中的消息总长度）
+ */
+static uint32_t fill_block(uint8_t block[64], uint32_t tail_len, uint64_t full, uint64_t nonce)
+{
+    char buf[20];
+    uint32_t n = 0;
+    do {
+        buf[n++] = (char)('0' + nonce % 10);
+        nonce /= 10;
+    } while (nonce > 0);
+    uint32_t len = tail_len + n;
+    if (len > MAX_SINGLE_BLOCK)
+        return 0;
+    for (uint32_t i = 0; i < n; i++)
+        block[tail_len + i] = (uint8_t)buf[n - 1 - i];
+    block[len] = 0x80;
+    memset(block + len + 1, 0, 64 - 8 - len - 1);
+    uint64_t bit_len = (full + len) * 8;
+    for (int i = 0; i < 8; i++)
+        block[63 - i] = (uint8_t)(bit_len >> (8 * i));
+    return n;
+}
+
+/*
+ * 从 nonce_start 开始搜索最小的 nonce，使 SHA-256(prefix + str(nonce)) 的十六进制前缀有 difficulty 个 0。
+ * 返回找到的 nonce；尾部消息超出单分组容量仍未找到时返回 -1，并在 *resume 中写入下一个待尝试的 nonce，
+ * 调用方可从该处交给其他实现继续搜索。
+ */
+int64_t sha_ni_mine(const uint8_t *prefix, uint32_t prefix_len, uint64_t nonce_start, int difficulty, uint64_t *resume)
+{
+    uint8_t block[64];
+    uint32_t mid[8], digest[8];
+    uint64_t nonce = nonce_start;
+    uint32_t full = prefix_len / 64 * 64;
+    uint32_t tail_len = prefix_len - full;
+
+    *resume = nonce;
+    if (tail_len >= MAX_SINGLE_BLOCK)
+        return -1;
+    memcpy(mid, H0, sizeof(mid));
+    for (uint32_t off = 0; off < full; off += 64)
+        sha256_block(mid, mid, prefix + off);
+    memcpy(block, prefix + full, tail_len);
+    uint32_t digits = fill_block(block, tail_len, full, nonce);
+    if (digits == 0)
+        return -1;
+
+    for (;;) {
+        sha256_block(digest, mid, block);
+        if (digest_ok(digest, difficulty))
+            return (int64_t)nonce;
+
+        /* 就地递增 ASCII 数字；只有发生进位溢出（位数增加）时才重新填充整个分组 */
+        nonce++;
+        int i = (int)(tail_len + digits) - 1;
+        while (i >= (int)tail_len && block[i] == '9')
+            block[i--] = '0';
+        if (i >= (int)tail_len) {
+            block[i]++;
+        } else {
+            digits = fill_block(block, tail_len, full, nonce);
+            if (digits == 0) {
+                *resume = nonce;
+                return -1;
+            }
+        }
+    }
+}